@@ -396,7 +396,14 @@ ipcMain.handle('tts-synthesize', async (event, text, options) => {
             throw new Error(`TTS Server Error ${response.status}: ${errorText}`);
         }
 
-        return await response.json();
+        // Server returns raw WAV bytes with metadata in headers
+        const audio = new Uint8Array(await response.arrayBuffer());
+        return {
+            audio,
+            sample_rate: Number(response.headers.get('X-Sample-Rate')) || 24000,
+            duration: Number(response.headers.get('X-Duration')) || 0,
+            engine: response.headers.get('X-Engine')
+        };
     } catch (error) {
         console.error('[Main] TTS synthesis failed:', error);
         return { error: error.message };
@@ -10,6 +10,7 @@ export class AudioPlayer {
         this.amplitudeCallback = null;
         this.onEndCallback = null;
         this.animationFrameId = null;
+        this.objectUrl = null;
 
         // For amplitude analysis
         this.audioContext = null;
@@ -18,27 +19,33 @@ export class AudioPlayer {
     }
 
     /**
-     * Decode base64 audio and play
-     * @param {string} b64Audio - Base64 encoded WAV
+     * Play WAV audio
+     * @param {Uint8Array|string} audioData - Raw WAV bytes (or legacy base64 string)
      */
-    async play(b64Audio) {
+    async play(audioData) {
         try {
             this.stop(); // Stop any current playback
 
-            console.log('[AudioPlayer] Starting playback, data length:', b64Audio?.length || 0);
+            console.log('[AudioPlayer] Starting playback, data length:', audioData?.length || 0);
 
-            if (!b64Audio || b64Audio.length === 0) {
+            if (!audioData || audioData.length === 0) {
                 console.error('[AudioPlayer] No audio data received');
                 this._handleEnded();
                 return;
             }
 
-            // Create data URL from base64
-            const dataUrl = `data:audio/wav;base64,${b64Audio}`;
-            console.log('[AudioPlayer] Created data URL');
+            // Raw bytes play from a Blob URL; base64 strings from a data URL
+            let src;
+            if (typeof audioData === 'string') {
+                src = `data:audio/wav;base64,${audioData}`;
+            } else {
+                this.objectUrl = URL.createObjectURL(new Blob([audioData], { type: 'audio/wav' }));
+                src = this.objectUrl;
+            }
+            console.log('[AudioPlayer] Created audio URL');
 
             // Create Audio element
-            this.audio = new Audio(dataUrl);
+            this.audio = new Audio(src);
 
             // Set up event handlers
             this.audio.onended = () => {
@@ -123,6 +130,11 @@ export class AudioPlayer {
             this.sourceNode = null;
         }
 
+        if (this.objectUrl) {
+            URL.revokeObjectURL(this.objectUrl);
+            this.objectUrl = null;
+        }
+
         if (this.animationFrameId) {
             cancelAnimationFrame(this.animationFrameId);
             this.animationFrameId = null;
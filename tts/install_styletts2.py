@@ -2,13 +2,16 @@ import sys
 import subprocess
 import os
 
+from install_tts import pip_install
+
 def install_styletts2():
     print("Installing StyleTTS2 (Experimental)...")
     print("Note: This will download heavy dependencies (~2GB installed size).")
     
     try:
-        # Install the package
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "styletts2"])
+        # Install the package, compiling bytecode for it and its torch
+        # dependency tree so the first server start doesn't pay for it
+        pip_install("styletts2", compile_bytecode=True)
         
         # Verify import and optional model preparation
         print("Verifying installation...")
@@ -1,6 +1,35 @@
 import sys
 import subprocess
 import os
+import shutil
+
+def pip_install(*args, compile_bytecode=False):
+    """Install packages with uv if available, otherwise pip.
+
+    Bytecode compilation is skipped unless compile_bytecode is set, for
+    heavy packages whose first import would otherwise pay for it.
+    Set TTS_INDEX_URL to override the package index (e.g. for CI mirrors).
+    """
+    uv = shutil.which("uv")
+    if uv:
+        # uv resolves and downloads in parallel; target this interpreter
+        cmd = [uv, "pip", "install", "--python", sys.executable]
+        if compile_bytecode:
+            cmd.append("--compile-bytecode")
+    else:
+        cmd = [
+            sys.executable, "-m", "pip", "install",
+            "--prefer-binary", "--disable-pip-version-check"
+        ]
+        if not compile_bytecode:
+            cmd.append("--no-compile")
+    cmd += args
+
+    index_url = os.environ.get("TTS_INDEX_URL")
+    if index_url:
+        cmd += ["--index-url", index_url]
+
+    subprocess.check_call(cmd)
 
 def install_requirements():
     print("Checking Python version...")
@@ -12,7 +41,7 @@ def install_requirements():
     req_file = os.path.join(os.path.dirname(__file__), "requirements.txt")
     
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", req_file])
+        pip_install("-r", req_file)
         print("Base requirements installed successfully.")
         return True
     except subprocess.CalledProcessError as e:
@@ -1,17 +1,21 @@
 import os
-import sys
 import base64
 import io
-import tempfile
+import re
+import json
+import struct
+import wave
 import asyncio
 import logging
+import hashlib
+import importlib
+import importlib.util
+from collections import OrderedDict
 from typing import Optional, Dict, Any, Literal
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 
-import numpy as np
-import soundfile as sf
-import pyttsx3
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 
 # Configure logging
@@ -24,79 +28,232 @@ active_engine_type = "system"
 
 # --- TTS Engines ---
 
-import threading
-
 import threading
 import queue
 
 import comtypes.client
 
+# Back-pressure: each engine admits at most this many in-flight requests
+# (however many sentences they have); beyond that /synthesize answers 503
+# instead of piling up latency.
+# SAPI runs on a single COM-apartment thread (SapiWorker); StyleTTS2 goes
+# through the NeuralBatcher, which runs one (batched) inference at a time so
+# GPU kernels don't contend (and we don't risk OOM).
+TTS_QUEUE_SIZE = int(os.environ.get("TTS_QUEUE_SIZE", 32))
+
+# Neural micro-batching: requests arriving within the window share one call
+# (only used when the model exposes inference_batch)
+TTS_NEURAL_MAX_BATCH = int(os.environ.get("TTS_NEURAL_MAX_BATCH", 8))
+TTS_NEURAL_BATCH_WINDOW = float(os.environ.get("TTS_NEURAL_BATCH_WINDOW_MS", 20)) / 1000
+
+# Preferred SAPI voice by its Name attribute (e.g. "Microsoft Zira Desktop").
+# When set, the description scan for a female voice is skipped.
+SAPI_VOICE = os.environ.get("SAPI_VOICE")
+
+# SAPI renders into memory at 24kHz 16-bit mono (SAFT24kHz16BitMono)
+SAPI_SAMPLE_RATE = 24000
+SAPI_AUDIO_FORMAT = 26
+# Recreate the reused memory stream once it has grown past this (~20s of audio)
+SAPI_STREAM_SHRINK_BYTES = 1024 * 1024
+
+# StyleTTS2 inference output rate
+STYLETTS2_SAMPLE_RATE = 24000
+
+# Canonical 44-byte PCM WAV header (RIFF, fmt, data)
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+def _wav_header(data_size: int, sample_rate: int) -> bytes:
+    """Build a 16-bit mono PCM WAV header for data_size bytes of samples"""
+    return _WAV_HEADER.pack(
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b"data", data_size
+    )
+
+def _pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV container with a single copy"""
+    return b"".join((_wav_header(len(pcm), sample_rate), pcm))
+
+def _make_silence_wav(sample_rate: int, seconds: float) -> bytes:
+    return _pcm_to_wav(bytes(2 * int(sample_rate * seconds)), sample_rate)
+
+# Returned for inputs with nothing to say (e.g. "." or "...") without
+# touching an engine
+_SILENCE_100MS_24K = _make_silence_wav(24000, 0.1)
+
+def _is_canonical_wav(buf: bytes) -> bool:
+    return buf[:4] == b"RIFF" and buf[8:12] == b"WAVE" and buf[36:40] == b"data"
+
+def _wav_frames(buf: bytes):
+    """Return (sample_rate, pcm) for a WAV, slicing the samples without copying"""
+    if _is_canonical_wav(buf):
+        sample_rate = struct.unpack_from("<I", buf, 24)[0]
+        data_size = struct.unpack_from("<I", buf, 40)[0]
+        return sample_rate, memoryview(buf)[44:44 + data_size]
+    # Extra chunks before the data; let the wave module walk them
+    with wave.open(io.BytesIO(buf), "rb") as w:
+        return w.getframerate(), w.readframes(w.getnframes())
+
+def _wav_meta(buf: bytes):
+    """Return (sample_rate, duration) from the fixed offsets of a PCM WAV header"""
+    if not _is_canonical_wav(buf):
+        with wave.open(io.BytesIO(buf), "rb") as w:
+            sample_rate = w.getframerate()
+            return sample_rate, w.getnframes() / sample_rate
+    sample_rate, byte_rate = struct.unpack_from("<II", buf, 24)
+    data_size = struct.unpack_from("<I", buf, 40)[0]
+    return sample_rate, data_size / byte_rate
+
+def _concat_wavs(chunks: list[bytes]) -> bytes:
+    """Join same-format mono 16-bit WAV chunks into a single WAV"""
+    frames = []
+    sample_rate = SAPI_SAMPLE_RATE
+    for chunk in chunks:
+        sample_rate, pcm = _wav_frames(chunk)
+        frames.append(pcm)
+    data_size = sum(len(f) for f in frames)
+    return b"".join([_wav_header(data_size, sample_rate), *frames])
+
 class SystemTTS:
     def __init__(self):
-        # We don't need a persistent object for SAPI if we init per request properly
-        # But to be safe and fast, we can try to keep one or just init when needed.
-        # SAPI is COM based, so thread apartment matters.
+        # SAPI is COM based, so thread apartment matters. Only the SapiWorker
+        # thread touches this object; the SpVoice and output stream are built
+        # there on first use and reused for its lifetime.
+        self.voice = None
+        self.stream = None
+        self.stream_size = 0 # High-water mark of bytes written to the stream
         logger.info("System TTS (Direct SAPI5) initialized mode")
 
-    def synthesize(self, text: str, output_file: str):
-        """Synthesize text to file using Direct SAPI5"""
-        
-        # Initialize COM in this thread
-        comtypes.CoInitialize()
+    def _get_voice(self):
+        """Return the cached SpVoice, creating it on first use"""
+        if self.voice is not None:
+            return self.voice
+
+        # Create SAPI SpVoice object
+        voice = comtypes.client.CreateObject("SAPI.SpVoice")
+
+        # Set voice (SAPI_VOICE, else try to find Zira/Female)
+        target_voice = self._find_voice_token(voice)
+        if target_voice:
+            voice.Voice = target_voice
+
+        # Set fast rate (-10 to 10)
+        voice.Rate = 1 # Slightly faster
+
+        self.voice = voice
+        self._new_stream()
+        return voice
+
+    def _new_stream(self):
+        """Attach a fresh in-memory output stream with the fixed format"""
+        audio_format = comtypes.client.CreateObject("SAPI.SpAudioFormat")
+        audio_format.Type = SAPI_AUDIO_FORMAT
+        stream = comtypes.client.CreateObject("SAPI.SpMemoryStream")
+        stream.Format = audio_format
+
+        # Connect voice to stream
+        self.voice.AudioOutputStream = stream
+        self.stream = stream
+        self.stream_size = 0
+
+    def _find_voice_token(self, voice):
+        if SAPI_VOICE:
+            # SAPI filters by attribute natively, no Python-side enumeration
+            voices = voice.GetVoices(f"Name={SAPI_VOICE}")
+            if voices.Count:
+                return voices.Item(0)
+            logger.warning(f"SAPI voice '{SAPI_VOICE}' not found, falling back to scan")
+
+        voices = voice.GetVoices()
+        for i in range(voices.Count):
+            v = voices.Item(i)
+            desc = v.GetDescription()
+            if 'zira' in desc.lower() or 'female' in desc.lower():
+                return v
+        return None
+
+    def synthesize(self, text: str) -> bytes:
+        """Synthesize text to WAV bytes using Direct SAPI5"""
         try:
-            # Create SAPI SpVoice object
-            voice = comtypes.client.CreateObject("SAPI.SpVoice")
-            
-            # Set voice (try to find Zira/Female)
-            # Get available voices
-            voices = voice.GetVoices()
-            target_voice = None
-            
-            for i in range(voices.Count):
-                v = voices.Item(i)
-                desc = v.GetDescription()
-                if 'zira' in desc.lower() or 'female' in desc.lower():
-                    target_voice = v
-                    break
-            
-            if target_voice:
-                voice.Voice = target_voice
-                
-            # Set fast rate (-10 to 10)
-            voice.Rate = 1 # Slightly faster
-            
-            # Create File Stream
-            stream = comtypes.client.CreateObject("SAPI.SpFileStream")
-            stream.Open(output_file, 3, False) # 3 = SSFMCreateForWrite
-            
-            # Connect voice to stream
-            voice.AudioOutputStream = stream
-            
+            voice = self._get_voice()
+
+            # Rewind the reused stream; the new audio overwrites the old from
+            # the start. (SetData(b"") can't be used to empty it: comtypes
+            # marshals empty sequences as VT_NULL, not an empty byte array.)
+            stream = self.stream
+            stream.Seek(0, 0) # 0 = SSSPTRelativeToStart
+
             # Speak (Flags: 0 = Default)
             voice.Speak(text, 0)
-            
-            # Close stream
-            stream.Close()
-            
-            return output_file
-            
+
+            # The buffer may still hold a longer earlier utterance past this
+            # one, so read back only what was written (the current position)
+            size = int(stream.Seek(0, 1)) # 1 = SSSPTRelativeToCurrentPosition
+            stream.Seek(0, 0)
+            data = stream.Read(size) # -> (buffer, bytes_read)
+            if isinstance(data, tuple):
+                data = data[0]
+            pcm = bytes(data)[:size]
+
+            # The stream never shrinks; after one long utterance, swap it for
+            # a fresh one so its memory isn't held for the server's lifetime
+            self.stream_size = max(self.stream_size, size)
+            if self.stream_size > SAPI_STREAM_SHRINK_BYTES and self.stream_size > 4 * size:
+                self._new_stream()
+
+            # Memory stream holds raw PCM, so add the RIFF header ourselves
+            return _pcm_to_wav(pcm, SAPI_SAMPLE_RATE)
+
         except Exception as e:
             logger.error(f"SAPI5 synthesis failed: {e}")
             raise e
-        finally:
-            comtypes.CoUninitialize()
+
+# Cheap availability check; the heavy styletts2/torch import chain is deferred
+STYLETTS2_AVAILABLE = importlib.util.find_spec("styletts2") is not None
+
+_styletts2_tts_mod = None
+_styletts2_import_lock = threading.Lock()
+
+def _import_styletts2():
+    """Import styletts2.tts once and cache the module"""
+    global _styletts2_tts_mod, STYLETTS2_AVAILABLE
+    with _styletts2_import_lock:
+        if _styletts2_tts_mod is None:
+            try:
+                _styletts2_tts_mod = importlib.import_module("styletts2.tts")
+            except ImportError:
+                # Installed but broken (torch, phonemizer, ...); stop advertising it
+                STYLETTS2_AVAILABLE = False
+                raise
+    return _styletts2_tts_mod
+
+# StyleTTS2 inference precision: fp32 (default), fp16 (CUDA autocast) or
+# int8 (CPU dynamic quantization of Linear layers)
+TTS_NEURAL_PRECISION = os.environ.get("TTS_NEURAL_PRECISION", "fp32").lower()
 
 class StyleTTS2Wrapper:
     def __init__(self):
         self.model = None
         self.ready = False
-        
+        self._precision_ctx = nullcontext
+        self._load_lock = threading.Lock()
+        # Inference is serialized; concurrency comes from batching instead
+        self._infer_lock = threading.Lock()
+
     def load(self):
+        # Serialize loading so concurrent first requests don't load twice
+        with self._load_lock:
+            if self.ready:
+                return
+            self._load()
+
+    def _load(self):
         try:
-            from styletts2 import tts
+            tts = _import_styletts2()
             self.model = tts.StyleTTS2()
+            self._apply_precision()
             self.ready = True
-            logger.info("StyleTTS2 loaded successfully")
+            logger.info(f"StyleTTS2 loaded successfully ({TTS_NEURAL_PRECISION})")
         except ImportError:
             logger.error("StyleTTS2 package not found. Install it to use neural voice.")
             raise ImportError("StyleTTS2 not installed")
@@ -104,17 +261,342 @@ class StyleTTS2Wrapper:
             logger.error(f"Failed to load StyleTTS2: {e}")
             raise e
 
-    def synthesize(self, text: str, output_file: str):
+    def _apply_precision(self):
+        if TTS_NEURAL_PRECISION == "fp32":
+            return
+
+        import torch
+
+        if TTS_NEURAL_PRECISION == "fp16":
+            if not torch.cuda.is_available():
+                logger.warning("fp16 needs CUDA, using fp32")
+                return
+            # Autocast rather than .half(): styletts2 builds fp32 inputs internally
+            self._precision_ctx = lambda: torch.autocast("cuda", dtype=torch.float16)
+        elif TTS_NEURAL_PRECISION == "int8":
+            if torch.cuda.is_available():
+                logger.warning("int8 dynamic quantization is CPU-only, using fp32")
+                return
+            # self.model.model holds the sub-networks (text encoder, predictor,
+            # decoder, ...). Quantize in place: self.model.sampler already wraps
+            # model.diffusion.diffusion, so copies would leave it running fp32
+            # (and keep the fp32 weights alive).
+            for module in self.model.model.values():
+                torch.ao.quantization.quantize_dynamic(
+                    module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+                )
+
+            modules = list(self.model.model.values())
+            sampler = getattr(self.model, "sampler", None)
+            if isinstance(sampler, torch.nn.Module):
+                modules.append(sampler)
+            leftover = sum(
+                type(m) is torch.nn.Linear for module in modules for m in module.modules()
+            )
+            if leftover:
+                logger.warning(f"int8: {leftover} Linear layers were not quantized")
+        else:
+            logger.warning(f"Unknown TTS_NEURAL_PRECISION '{TTS_NEURAL_PRECISION}', using fp32")
+
+    def warmup(self):
+        """Load the model and run one dummy inference to warm up kernels/allocator"""
+        self.load()
+        with self._infer_lock, self._precision_ctx():
+            self.model.inference("Warming up.")
+        logger.info("StyleTTS2 warmed up")
+
+    @property
+    def supports_batch(self) -> bool:
+        """True once a model with a real batched inference API is loaded"""
+        return self.ready and hasattr(self.model, "inference_batch")
+
+    def synthesize(self, text: str) -> bytes:
+        return self.synthesize_batch([text])[0]
+
+    def synthesize_batch(self, texts: list[str]) -> list[bytes]:
+        """Synthesize several texts in one call, batched if the model supports it"""
         if not self.ready:
             self.load()
-            
-        # StyleTTS2 returns a numpy array, but the wrapper also saves to file if requested
-        self.model.inference(text, output_wav_file=output_file)
-        return output_file
+
+        with self._infer_lock, self._precision_ctx():
+            inference_batch = getattr(self.model, "inference_batch", None)
+            if inference_batch is not None and len(texts) > 1:
+                wavs = inference_batch(texts)
+            else:
+                wavs = [self.model.inference(text) for text in texts]
+
+        return [self._encode(wav) for wav in wavs]
+
+    @staticmethod
+    def _encode(wav) -> bytes:
+        # StyleTTS2 returns a numpy array; encode it to WAV in memory.
+        # soundfile is only needed here, so keep it off the SAPI startup path
+        import soundfile as sf
+        buf = io.BytesIO()
+        sf.write(buf, wav, STYLETTS2_SAMPLE_RATE, format="WAV", subtype="PCM_16")
+        return buf.getvalue()
+
+class AdmissionLimit:
+    """Caps in-flight requests; a request holds one slot until all its futures are done"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+
+    def admit(self, futures: list[asyncio.Future]):
+        """Take a slot for futures (event loop only); raises queue.Full when saturated"""
+        if self.active >= self.limit:
+            raise queue.Full
+        self.active += 1
+
+        # Cancelled futures count as done, so abandoned requests free their slot at once
+        remaining = len(futures)
+        def _on_done(_):
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                self.active -= 1
+        for future in futures:
+            future.add_done_callback(_on_done)
+
+class NeuralBatcher:
+    """Coalesces StyleTTS2 requests arriving within a short window into one call.
+
+    Only when the model has a batch API; otherwise sentences run one at a
+    time in FIFO order and each resolves as soon as it's done.
+    """
+
+    def __init__(self, max_batch: int, window: float):
+        self.max_batch = max_batch
+        self.window = window
+        self._admission = AdmissionLimit(TTS_QUEUE_SIZE)
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    def submit(self, texts: list[str]) -> list[asyncio.Future]:
+        """Queue one request's sentences; raises queue.Full when saturated"""
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        self._admission.admit(futures)
+        for text, future in zip(texts, futures):
+            self._queue.put_nowait((text, future))
+        return futures
+
+    async def _collect(self):
+        """Wait for one request, then gather more until the batch or window is full"""
+        items = [await self._queue.get()]
+        while len(items) < self.max_batch and not self._queue.empty():
+            items.append(self._queue.get_nowait())
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(items) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        while True:
+            # Without a batch API a batch would just run serially and hold
+            # every result back until the last one, so go one at a time
+            if neural_tts.supports_batch:
+                items = await self._collect()
+            else:
+                items = [await self._queue.get()]
+            # Skip requests whose callers already went away
+            items = [(text, fut) for text, fut in items if not fut.done()]
+            if not items:
+                continue
+
+            try:
+                results = await asyncio.to_thread(neural_tts.synthesize_batch, [text for text, _ in items])
+            except Exception as e:
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            for (_, fut), audio_data in zip(items, results):
+                if not fut.done():
+                    fut.set_result(audio_data)
+
+def _resolve_future(future: asyncio.Future, result, error):
+    # Runs on the event loop; the caller may have given up in the meantime
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+class SapiWorker:
+    """Single COM-apartment thread that owns the SpVoice and drains a request queue"""
+
+    def __init__(self, max_requests: int):
+        self._admission = AdmissionLimit(max_requests)
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sapi", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._queue.put(None)
+
+    def submit(self, texts: list[str]) -> list[asyncio.Future]:
+        """Queue one request's sentences as a single item; raises queue.Full when saturated"""
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        self._admission.admit(futures)
+        self._queue.put((texts, futures, loop))
+        return futures
+
+    def _run(self):
+        comtypes.CoInitialize()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+
+                texts, futures, loop = item
+                for text, future in zip(texts, futures):
+                    if future.done():
+                        continue # Request was cancelled while queued
+
+                    # Resolve each sentence as soon as it's rendered
+                    try:
+                        result, error = system_tts.synthesize(text), None
+                    except Exception as e:
+                        result, error = None, e
+                    loop.call_soon_threadsafe(_resolve_future, future, result, error)
+        finally:
+            comtypes.CoUninitialize()
 
 # Initialize engines
 system_tts = SystemTTS()
 neural_tts = StyleTTS2Wrapper()
+sapi_worker = SapiWorker(TTS_QUEUE_SIZE)
+neural_batcher = NeuralBatcher(TTS_NEURAL_MAX_BATCH, TTS_NEURAL_BATCH_WINDOW)
+
+# --- Sentence Pipeline ---
+
+# Precompiled once; applied to every request before sentence splitting
+_URL_RE = re.compile(r"https?://\S+")
+# Emphasis hugs its text, so a spaced "2 * 3 * 4" is left alone
+_MD_STAR_RE = re.compile(r"(\*{1,3})(?=\S)(.+?)(?<=\S)\1")
+# Underscore emphasis only at word boundaries so snake_case survives
+_MD_UNDERSCORE_RE = re.compile(r"(?<!\w)(_{1,3})(.+?)\1(?!\w)")
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_EMOJI_RE = re.compile(r"[\U0001F300-\U0001FAFF\U00002600-\U000027BF\uFE0F]")
+_SPACE_RE = re.compile(r"\s{2,}")
+# Only close gaps left after a word by a removed token; "Hello. ..." keeps its break
+_SPACE_PUNCT_RE = re.compile(r"(?<=\w)\s+([.,!?;:])")
+_NO_SPEECH_RE = re.compile(r"[\W_]*")
+
+def clean_for_speech(text: str) -> str:
+    """Strip URLs, markdown emphasis, parenthetical asides and emoji"""
+    text = _URL_RE.sub("", text)
+    text = _MD_STAR_RE.sub(r"\2", text)
+    text = _MD_UNDERSCORE_RE.sub(r"\2", text)
+    text = _PAREN_RE.sub("", text)
+    text = _EMOJI_RE.sub("", text)
+    text = _SPACE_PUNCT_RE.sub(r"\1", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+def has_speech(text: str) -> bool:
+    """False for empty or punctuation/symbol-only text"""
+    return _NO_SPEECH_RE.fullmatch(text) is None
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+def split_sentences(text: str) -> list[str]:
+    """Split text on sentence-ending punctuation"""
+    return [s for s in _SENTENCE_SPLIT_RE.split(text.strip()) if s.strip()]
+
+def _submit_sentences(text: str, engine: str) -> list[asyncio.Future]:
+    """Queue every sentence as one request; callers await the futures in order.
+
+    Raises queue.Full when the engine is already at TTS_QUEUE_SIZE requests.
+    """
+    sentences = split_sentences(text)
+    if engine == "styletts2":
+        return neural_batcher.submit(sentences)
+    # System TTS (Direct SAPI5) on the dedicated COM thread
+    return sapi_worker.submit(sentences)
+
+def _cancel_tasks(tasks: list[asyncio.Future]):
+    for task in tasks:
+        task.cancel()
+
+# --- Audio Cache ---
+
+class AudioCache:
+    """Small thread-safe LRU of synthesized audio keyed by engine/params/text.
+
+    Bounded by both entry count and total audio bytes; a single entry larger
+    than a quarter of the byte budget is not cached at all.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data = OrderedDict() # key -> (value, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(engine: str, params: Optional[Dict[str, Any]], text: str) -> str:
+        items = sorted((params or {}).items())
+        return hashlib.blake2b(f"{engine}|{items}|{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, value, nbytes: int):
+        if self.maxsize <= 0 or nbytes > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, nbytes)
+            self._bytes += nbytes
+            while len(self._data) > self.maxsize or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+            self._bytes = 0
+            return count
+
+# Set TTS_CACHE_SIZE=0 to disable caching; TTS_CACHE_MAX_BYTES caps total audio held
+audio_cache = AudioCache(
+    int(os.environ.get("TTS_CACHE_SIZE", 256)),
+    int(os.environ.get("TTS_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+)
 
 # --- API Models ---
 
@@ -130,102 +612,182 @@ class HealthResponse(BaseModel):
 
 # --- FastAPI App ---
 
+# Set TTS_PRELOAD_NEURAL=1 to load and warm StyleTTS2 at startup instead of
+# on the first neural request
+TTS_PRELOAD_NEURAL = os.environ.get("TTS_PRELOAD_NEURAL", "0") == "1"
+
+async def _preload_neural():
+    try:
+        await asyncio.to_thread(neural_tts.warmup)
+    except Exception as e:
+        logger.warning(f"StyleTTS2 preload skipped: {e}")
+
+async def _warm_import_neural():
+    try:
+        await asyncio.to_thread(_import_styletts2)
+    except Exception as e:
+        logger.warning(f"StyleTTS2 import failed: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("TTS Server starting...")
+    sapi_worker.start()
+    neural_batcher.start()
+
+    # Preload (or at least import) in the background so /health answers immediately
+    preload_task = None
+    if TTS_PRELOAD_NEURAL:
+        preload_task = asyncio.create_task(_preload_neural())
+    elif STYLETTS2_AVAILABLE:
+        preload_task = asyncio.create_task(_warm_import_neural())
     yield
     # Shutdown
     logger.info("TTS Server shutting down...")
+    if preload_task:
+        preload_task.cancel()
+    neural_batcher.stop()
+    sapi_worker.stop()
 
 app = FastAPI(lifespan=lifespan)
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     engines = ["system"]
-    try:
-        import styletts2
+    if STYLETTS2_AVAILABLE:
         engines.append("styletts2")
-    except ImportError:
-        pass
-        
+
     return HealthResponse(
         status="ready",
         active_engine=active_engine_type,
         available_engines=engines
     )
 
-@app.post("/synthesize")
-async def synthesize(request: SynthesisRequest):
-    """
-    Synthesize text to audio.
-    Returns base64 encoded WAV data.
-    """
+@app.post("/cache/clear")
+async def clear_cache():
+    """Drop all cached synthesis results"""
+    return {"cleared": audio_cache.clear()}
+
+async def _synthesize_audio(request: SynthesisRequest):
+    """Shared synthesis path: returns (wav_bytes, sample_rate, duration)"""
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
 
-    temp_file = ""
+    text = clean_for_speech(request.text)
+    if not has_speech(text):
+        return (_SILENCE_100MS_24K, *_wav_meta(_SILENCE_100MS_24K))
+
+    # Repeated lines (greetings, UI prompts, errors) skip synthesis entirely
+    cache_key = AudioCache.make_key(request.engine, request.style_params, text)
+    cached = audio_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Sentences render one after another on the engine's worker and are joined in order
     try:
-        # Create temp file for output
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as fp:
-            temp_file = fp.name
-        
-        # Close handle so engine can write to it
-        
-        if request.engine == "styletts2":
-            try:
-                # Run in thread pool to avoid blocking
-                await asyncio.to_thread(neural_tts.synthesize, request.text, temp_file)
-            except ImportError:
-                # Fallback silently or error? For V1, let's error so frontend knows
-                raise HTTPException(status_code=503, detail="StyleTTS2 not installed")
-            except Exception as e:
-                logger.error(f"StyleTTS2 error: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
-        else:
-            # System TTS (Direct SAPI5)
-            # Run in thread to keep API responsive, even though SAPI is fast
-            await asyncio.to_thread(system_tts.synthesize, request.text, temp_file)
+        tasks = _submit_sentences(text, request.engine)
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="TTS queue full, try again shortly")
+
+    try:
+        try:
+            chunks = await asyncio.gather(*tasks)
+        except ImportError:
+            # Fallback silently or error? For V1, let's error so frontend knows
+            raise HTTPException(status_code=503, detail="StyleTTS2 not installed")
+        finally:
+            _cancel_tasks(tasks)
 
-        # Read back the file
-        if not os.path.exists(temp_file) or os.path.getsize(temp_file) == 0:
+        audio_data = chunks[0] if len(chunks) == 1 else _concat_wavs(chunks)
+
+        # Get duration and sample rate for metadata from the WAV header.
+        # Engines always emit a header, so check for samples, not bytes
+        sample_rate, duration = _wav_meta(audio_data)
+        if duration == 0:
              raise HTTPException(status_code=500, detail="Audio generation failed (empty output)")
 
-        with open(temp_file, "rb") as f:
-            audio_data = f.read()
-            
-        # Encode to base64
-        b64_audio = base64.b64encode(audio_data).decode("utf-8")
-        
-        # Get duration and sample rate for metadata
-        # We can read the first few bytes or use soundfile to check
-        try:
-             info = sf.info(temp_file)
-             duration = info.duration
-             sample_rate = info.samplerate
-        except:
-             duration = 0
-             sample_rate = 24000 # Default assumption
-
-        return {
-            "audio": b64_audio,
-            "sample_rate": sample_rate,
-            "duration": duration,
-            "engine": request.engine
-        }
+        result = (audio_data, sample_rate, duration)
+        audio_cache.put(cache_key, result, len(audio_data))
+        return result
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Synthesis failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Cleanup temp file
-        if temp_file and os.path.exists(temp_file):
-            try:
-                os.unlink(temp_file)
-            except:
-                pass
+
+@app.post("/synthesize")
+async def synthesize(request: SynthesisRequest):
+    """
+    Synthesize text to audio.
+    Returns raw WAV bytes; metadata is in the X-Sample-Rate, X-Duration and
+    X-Engine headers.
+    """
+    audio_data, sample_rate, duration = await _synthesize_audio(request)
+    return Response(
+        content=audio_data,
+        media_type="audio/wav",
+        headers={
+            "X-Sample-Rate": str(sample_rate),
+            "X-Duration": f"{duration:.3f}",
+            "X-Engine": request.engine
+        }
+    )
+
+@app.post("/synthesize_json")
+async def synthesize_json(request: SynthesisRequest):
+    """
+    Synthesize text to audio.
+    Returns base64 encoded WAV data (legacy JSON API).
+    """
+    audio_data, sample_rate, duration = await _synthesize_audio(request)
+    return {
+        "audio": base64.b64encode(audio_data).decode("ascii"),
+        "sample_rate": sample_rate,
+        "duration": duration,
+        "engine": request.engine
+    }
+
+@app.post("/synthesize_stream")
+async def synthesize_stream(request: SynthesisRequest):
+    """
+    Synthesize text sentence by sentence.
+    Streams NDJSON lines {idx, audio, sample_rate, duration} in order as each
+    sentence completes, so playback can start before the whole text is done.
+    """
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+    text = clean_for_speech(request.text)
+    if has_speech(text):
+        try:
+            tasks = _submit_sentences(text, request.engine)
+        except queue.Full:
+            raise HTTPException(status_code=503, detail="TTS queue full, try again shortly")
+    else:
+        # Nothing to say; stream a single chunk of silence
+        tasks = [asyncio.create_task(asyncio.sleep(0, result=_SILENCE_100MS_24K))]
+
+    async def generate():
+        idx = 0
+        try:
+            for idx, task in enumerate(tasks):
+                audio_data = await task
+                sample_rate, duration = _wav_meta(audio_data)
+                yield json.dumps({
+                    "idx": idx,
+                    "audio": base64.b64encode(audio_data).decode("ascii"),
+                    "sample_rate": sample_rate,
+                    "duration": duration,
+                    "engine": request.engine
+                }) + "\n"
+        except Exception as e:
+            logger.error(f"Streaming synthesis failed: {e}")
+            yield json.dumps({"idx": idx, "error": str(e)}) + "\n"
+        finally:
+            _cancel_tasks(tasks)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 if __name__ == '__main__':
     import uvicorn
@@ -235,12 +797,24 @@ if __name__ == '__main__':
     parser.add_argument("--port", type=int, default=8765)
     args = parser.parse_args()
     
+    import platform
+
+    # uvloop and httptools are C-accelerated but optional (uvloop has no
+    # Windows build), so fall back to the stock asyncio loop / h11 parser
+    use_uvloop = platform.system() != "Windows" and importlib.util.find_spec("uvloop") is not None
+    use_httptools = importlib.util.find_spec("httptools") is not None
+
     # Use uvicorn.Config to enable socket reuse
     config = uvicorn.Config(
         app, 
         host="127.0.0.1", 
         port=args.port,
-        log_level="info"
+        log_level="warning",
+        access_log=False, # No per-request log line on the hot path
+        loop="uvloop" if use_uvloop else "asyncio",
+        http="httptools" if use_httptools else "h11",
+        timeout_keep_alive=30,
+        workers=1 # Model and cache state live in this process
     )
     server = uvicorn.Server(config)
     